@@ -0,0 +1,29 @@
+"""
+Deferred module imports for aidoctool.
+"""
+
+import importlib.util
+import sys
+
+
+def lazy(name):
+    """
+    Import a module whose body only runs on first attribute access.
+
+    Args:
+        name (str): The absolute module name, e.g. "yaml"
+
+    Returns:
+        module: The module, loaded lazily unless it was already imported
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -3,17 +3,79 @@ CLI entry point for aidoctool.
 Defines the main command group and registers subcommands.
 """
 
+import importlib
 import click
-import logging
-from aidoctool.config_loader import ConfigLoaderFactory
-from aidoctool.config_manager import ConfigManager, ReadOnlyConfigManager
 
-@click.group(help="aidoctool - AI-powered documentation and code tools")
+
+class LazyGroup(click.Group):
+    """Click group that imports subcommand modules only when they are invoked."""
+
+    def __init__(self, *args, lazy_subcommands=None, lazy_help=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Maps command name -> "module.path:attribute"
+        self.lazy_subcommands = lazy_subcommands or {}
+        # Maps command name -> short help shown by --help, so listing the
+        # commands does not import their modules
+        self.lazy_help = lazy_help or {}
+
+    def list_commands(self, ctx):
+        base = super().list_commands(ctx)
+        return sorted(set(base) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        cmd = super().get_command(ctx, cmd_name)
+        if cmd is None and cmd_name in self.lazy_subcommands:
+            cmd = self._lazy_load(cmd_name)
+            # Register the resolved command so later lookups are a plain
+            # dict hit in self.commands
+            self.add_command(cmd, cmd_name)
+        return cmd
+
+    def format_commands(self, ctx, formatter):
+        rows = []
+        for cmd_name in self.list_commands(ctx):
+            cmd = self.commands.get(cmd_name)
+            if cmd is None and cmd_name in self.lazy_subcommands:
+                rows.append((cmd_name, None))
+            elif cmd is not None and not cmd.hidden:
+                rows.append((cmd_name, cmd))
+        if not rows:
+            return
+        # Same layout as click.Group.format_commands
+        limit = formatter.width - 6 - max(len(cmd_name) for cmd_name, _ in rows)
+        rows = [
+            (cmd_name, cmd.get_short_help_str(limit) if cmd is not None else self.lazy_help.get(cmd_name, ""))
+            for cmd_name, cmd in rows
+        ]
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+    def _lazy_load(self, cmd_name):
+        module_name, attr = self.lazy_subcommands[cmd_name].split(":")
+        return getattr(importlib.import_module(module_name), attr)
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "config": "aidoctool.commands.config_command:config",
+        "debug": "aidoctool.commands.debug_command:debug",
+    },
+    lazy_help={
+        "config": "Manage aidoctool configuration profiles.",
+        "debug": "Debug and troubleshooting commands.",
+    },
+    help="aidoctool - AI-powered documentation and code tools",
+)
 @click.option("--debug/--no-debug", default=False, help="Enable debug output")
 @click.option("--config-source", default="yaml", type=click.Choice(["yaml", "env"]), help="Config source: yaml or env")
 @click.pass_context
 def cli(ctx, debug, config_source):
     """Main entry point for aidoctool."""
+    import logging
+    from aidoctool.config_loader import ConfigLoaderFactory
+    from aidoctool.config_manager import ConfigManager, ReadOnlyConfigManager
+
     # Set up logging
     level = logging.DEBUG if debug else logging.INFO
     logging.basicConfig(level=level, format="%(message)s")
@@ -26,12 +88,5 @@ def cli(ctx, debug, config_source):
     else:
         ctx.obj["config_manager"] = ConfigManager(loader)
 
-# Import and register subcommands
-from aidoctool.commands.config_command import config as config_command
-from aidoctool.commands.debug_command import debug as debug_command
-
-cli.add_command(config_command)
-cli.add_command(debug_command)
-
 if __name__ == "__main__":
     cli()
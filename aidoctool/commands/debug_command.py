@@ -4,7 +4,7 @@ Debug commands for aidoctool.
 
 import click
 import logging
-from aidoctool.debug_utils import dump_config, check_config_file_exists, get_config_dir
+from aidoctool.debug_utils import format_config, check_config_file_exists, get_config_dir, get_config_path
 
 logger = logging.getLogger(__name__)
 
@@ -26,15 +26,17 @@ def debug_config(ctx, verbose):
     
     try:
         config = config_manager.get_config()
-        formatted_config = dump_config(config, verbose)
+        formatted_config = format_config(config, verbose)
         click.echo(f"Current configuration:\n{formatted_config}")
         
-        if check_config_file_exists():
-            click.echo(f"Config file found at: {get_config_dir() / 'config.yaml'}")
+        # Report the file this manager actually loads from
+        config_path = get_config_path(config_manager)
+        if check_config_file_exists(config_path):
+            click.echo(f"Config file found at: {config_path}")
         else:
-            click.echo(f"Config file not found at: {get_config_dir() / 'config.yaml'}")
+            click.echo(f"Config file not found at: {config_path}")
             
-        click.echo(f"Config directory: {get_config_dir()}")
+        click.echo(f"Config directory: {get_config_dir(config_path)}")
     except Exception as e:
         logger.error(f"Error retrieving configuration: {e}")
         click.echo(f"ERROR: Error retrieving configuration: {e}")
@@ -52,11 +54,10 @@ def debug_info():
     click.echo(f"Working directory: {os.getcwd()}")
     
     # Check for environment variables
-    env_vars = [var for var in os.environ if var.startswith("AIDOCTOOL_")]
-    if env_vars:
+    env_items = [(var, value) for var, value in os.environ.items() if var.startswith("AIDOCTOOL_")]
+    if env_items:
         click.echo("AIDOCTOOL environment variables:")
-        for var in env_vars:
-            value = os.environ[var]
+        for var, value in env_items:
             # Mask API keys
             if "API_KEY" in var:
                 value = "sk-***" if value else None
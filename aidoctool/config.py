@@ -1,24 +1,19 @@
-import os
-import yaml
+import warnings
 from pathlib import Path
+from aidoctool.config_loader import YamlConfigLoader, _write_yaml
 
 CONFIG_PATH = Path.home() / ".aidoctool" / "config.yaml"
 
 # --- Config file helpers ---
+# Deprecated: commands go through ConfigManager (see aidoctool.config_manager),
+# which loads the file once per process instead of on every call.
 def load_config():
     """Load configuration from YAML file into a Python dict. Create a default structure if file missing."""
-    if not CONFIG_PATH.exists():
-        return {"default_profile": None, "profiles": {}}
-    with open(CONFIG_PATH, 'r') as f:
-        data = yaml.safe_load(f) or {}
-    data.setdefault("profiles", {})
-    data.setdefault("default_profile", None)
-    return data
+    warnings.warn("load_config() is deprecated; use ConfigManager.get_config()", DeprecationWarning, stacklevel=2)
+    return YamlConfigLoader(CONFIG_PATH).load_config()
 
 def save_config(config_data: dict):
     """Save the configuration dictionary back to the YAML file."""
-    os.makedirs(CONFIG_PATH.parent, exist_ok=True)
-    with open(CONFIG_PATH, 'w') as f:
-        yaml.safe_dump(config_data, f)
-    # Set file permissions to 600 (user-only)
-    os.chmod(CONFIG_PATH, 0o600)
+    warnings.warn("save_config() is deprecated; use ConfigManager.save()", DeprecationWarning, stacklevel=2)
+    # Written atomically with permissions 600 (user-only)
+    _write_yaml(CONFIG_PATH, config_data)
@@ -1,25 +1,55 @@
+import contextlib
+import copy
+import functools
 from aidoctool.config_loader import ConfigLoader, YamlConfigLoader, EnvConfigLoader
 
 class ConfigManager:
     def __init__(self, loader: ConfigLoader):
         self.loader = loader
-        self._config = None
+        self._defer_save = False
+
+    @functools.cached_property
+    def config(self):
+        # Loaded on first access, then a plain attribute read
+        return self.loader.load_config()
 
     def load(self):
-        self._config = self.loader.load_config()
-        return self._config
+        # Force a reload from the source, discarding unsaved in-memory edits
+        self.__dict__["config"] = self.loader.load_config(refresh=True)
+        return self.config
 
     def get_config(self):
-        if self._config is None:
-            return self.load()
-        return self._config
+        return self.config
 
     def save(self):
+        if self._defer_save:
+            return
         if hasattr(self.loader, 'save_config'):
-            self.loader.save_config(self._config)
+            self.loader.save_config(self.config)
         else:
             raise NotImplementedError("This config source is read-only.")
 
+    def has_profile(self, profile_name):
+        return profile_name in self.config.get("profiles", {})
+
+    @contextlib.contextmanager
+    def bulk_update(self):
+        """Defer saves made inside the block and write the config once at the end."""
+        outer = self._defer_save
+        # Edits are only kept if the block completes, so a failure halfway
+        # through cannot be persisted by a later save
+        snapshot = copy.deepcopy(self.config)
+        self._defer_save = True
+        try:
+            yield self
+        except BaseException:
+            self.__dict__["config"] = snapshot
+            raise
+        finally:
+            self._defer_save = outer
+        if not outer:
+            self.save()
+
     def add_profile(self, profile_name, provider, model, api_key, params=None):
         config = self.get_config()
         profiles = config.setdefault("profiles", {})
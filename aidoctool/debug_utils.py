@@ -3,13 +3,50 @@ Debug utilities for aidoctool.
 """
 
 import logging
-import yaml
 import os
 from pathlib import Path
+import aidoctool.config
+from aidoctool._lazy import lazy
+from aidoctool.config_loader import _safe_dumper
+
+yaml = lazy("yaml")
 
 logger = logging.getLogger(__name__)
 
-def dump_config(config, verbose=False):
+def _mask_profile(profile: dict) -> dict:
+    """Return the profile with its API key masked, if it has one."""
+    if "api_key" not in profile:
+        return profile
+    return {**profile, "api_key": "sk-***" if profile["api_key"] else None}
+
+def _mask(config: dict, verbose: bool = False) -> dict:
+    """
+    Return a copy of the configuration with API keys masked.
+    
+    Args:
+        config (dict): The configuration dictionary
+        verbose (bool): Whether to keep sensitive information like API keys
+        
+    Returns:
+        dict: The configuration, masked unless verbose
+    """
+    # Shallow copy; only the profiles whose API key is masked are duplicated
+    config_copy = {**config}
+    profiles = config.get("profiles")
+    if verbose or not isinstance(profiles, dict):
+        return config_copy
+    try:
+        # Profiles are mappings per the config schema
+        config_copy["profiles"] = {name: _mask_profile(profile) for name, profile in profiles.items()}
+    except TypeError:
+        # A malformed (non-mapping) profile; check each one individually
+        config_copy["profiles"] = {
+            name: _mask_profile(profile) if isinstance(profile, dict) else profile
+            for name, profile in profiles.items()
+        }
+    return config_copy
+
+def format_config(config: dict, verbose: bool = False) -> str:
     """
     Format the current configuration in a readable format.
     
@@ -20,61 +57,62 @@ def dump_config(config, verbose=False):
     Returns:
         str: The formatted configuration string
     """
-    if not config:
-        logger.info("No configuration found.")
+    if not isinstance(config, dict) or not config:
         return "No configuration found."
-    
-    # Create a deep copy to avoid modifying the original
-    config_copy = {}
-    if isinstance(config, dict):
-        import copy
-        config_copy = copy.deepcopy(config)
-    else:
-        logger.info(f"Config is not a dictionary: {type(config)}")
-        return f"Config is not a dictionary: {type(config)}"
-    
-    # Mask API keys if not verbose
-    if not verbose and "profiles" in config_copy and isinstance(config_copy["profiles"], dict):
-        for profile_name, profile in config_copy["profiles"].items():
-            if isinstance(profile, dict) and "api_key" in profile:
-                profile["api_key"] = "sk-***" if profile["api_key"] else None
-    
-    # Format and return
+
+    config_copy = _mask(config, verbose)
     try:
-        formatted = yaml.dump(config_copy, default_flow_style=False, sort_keys=False)
-        logger.info(f"Current configuration:\n{formatted}")
-        return formatted
+        return yaml.dump(config_copy, Dumper=_safe_dumper(), default_flow_style=False, sort_keys=False)
     except Exception as e:
         logger.error(f"Error formatting config: {e}")
         # Try a simpler representation if YAML dump fails
         try:
-            simple_repr = str(config_copy)
-            logger.info(f"Raw config: {simple_repr}")
-            return simple_repr
+            return str(config_copy)
         except:
             logger.error("Unable to display configuration")
             return "Unable to display configuration"
 
-def check_config_file_exists():
-    """Check if the config file exists and return its path."""
-    try:
-        from aidoctool.config import CONFIG_PATH
+def log_config(config: dict, verbose: bool = False) -> str:
+    """
+    Log the formatted configuration and return it.
+    
+    Args:
+        config (dict): The configuration dictionary
+        verbose (bool): Whether to show sensitive information like API keys
         
-        if CONFIG_PATH.exists():
-            logger.info(f"Config file found at: {CONFIG_PATH}")
+    Returns:
+        str: The formatted configuration string
+    """
+    formatted = format_config(config, verbose)
+    logger.info(f"Current configuration:\n{formatted}")
+    return formatted
+
+# Kept for existing callers; prefer format_config or log_config.
+dump_config = log_config
+
+def get_config_path(config_manager=None):
+    """Return the config file the manager loads from, or the default config path."""
+    config_path = getattr(getattr(config_manager, "loader", None), "config_path", None)
+    return config_path or aidoctool.config.CONFIG_PATH
+
+def check_config_file_exists(config_path=None):
+    """Check if the config file (by default the configured one) exists."""
+    try:
+        config_path = config_path or get_config_path()
+        if config_path.exists():
+            logger.info(f"Config file found at: {config_path}")
             return True
         else:
-            logger.warning(f"Config file not found at: {CONFIG_PATH}")
+            logger.warning(f"Config file not found at: {config_path}")
             return False
     except Exception as e:
         logger.error(f"Error checking config file: {e}")
         return False
 
-def get_config_dir():
+def get_config_dir(config_path=None):
     """Return the configuration directory."""
     try:
-        from aidoctool.config import CONFIG_PATH
-        return CONFIG_PATH.parent
+        return (config_path or get_config_path()).parent
     except Exception as e:
         logger.error(f"Error getting config directory: {e}")
         return Path.home() / ".aidoctool"
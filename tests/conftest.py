@@ -2,6 +2,7 @@
 Common pytest fixtures and configuration.
 """
 import os
+import subprocess
 import sys
 import pytest
 from pathlib import Path
@@ -15,3 +16,12 @@ def temp_config_dir(tmp_path):
     config_dir = tmp_path / ".aidoctool"
     os.makedirs(config_dir, exist_ok=True)
     return config_dir
+
+@pytest.fixture
+def run_fresh():
+    """Run Python code in a fresh interpreter, for checks on what gets imported."""
+    root = Path(__file__).parent.parent
+    env = {**os.environ, "PYTHONPATH": str(root)}
+    def run(code):
+        return subprocess.run([sys.executable, "-c", code], cwd=root, env=env, check=True, capture_output=True, text=True)
+    return run
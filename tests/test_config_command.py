@@ -1,82 +1,133 @@
 import os
-import tempfile
+import json
 import shutil
+import tempfile
 import pytest
+import yaml
 from click.testing import CliRunner
+from aidoctool.cli import cli
 from aidoctool.commands.config_command import config
 from aidoctool.config_manager import ConfigManager, ReadOnlyConfigManager
-from aidoctool.config_loader import YamlConfigLoader, EnvConfigLoader
+import aidoctool.config
+import aidoctool.config_loader
+from aidoctool.config_loader import YamlConfigLoader, EnvConfigLoader, _safe_loader, _safe_dumper
 import pathlib
 import sys
 
+_PROMPT = 'openai\ngpt-4\nsk-test\n'
+
+_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+_SEED_YAML = yaml.dump({
+    'profiles': {'toedit': {'provider': 'openai', 'model': 'gpt-4', 'api_key': 'sk-test', 'params': {}}},
+    'default_profile': 'toedit',
+}, Dumper=_DUMPER)
+
+_runner = CliRunner()
+
+def run(*args, input=None):
+    """Invoke the config group with args, letting unexpected errors propagate."""
+    return _runner.invoke(config, list(args), input=input, catch_exceptions=False)
+
+@pytest.fixture(scope="module")
+def _base_cfg(tmp_path_factory):
+    # Empty config serialized once per module; each test gets a copy
+    base = tmp_path_factory.mktemp("base") / "config.yaml"
+    base.write_text(yaml.dump({'profiles': {}, 'default_profile': None}, Dumper=_DUMPER))
+    return base
+
 @pytest.fixture(autouse=True)
-def isolate_config(monkeypatch, tmp_path):
+def isolate_config(monkeypatch, tmp_path_factory, _base_cfg):
     # Use a temporary directory for config file
-    temp_dir = tmp_path
-    temp_config = temp_dir / "config.yaml"
+    temp_dir = tmp_path_factory.mktemp('cfg', numbered=True)
     config_dir = temp_dir / ".aidoctool"
-    os.makedirs(config_dir, exist_ok=True)
-    monkeypatch.setattr('aidoctool.config_loader.Path.home', lambda: temp_dir)
-    monkeypatch.setattr('aidoctool.config.CONFIG_PATH', config_dir / "config.yaml")
-    yield
+    config_dir.mkdir(exist_ok=True)
+    config_path = config_dir / "config.yaml"
+    shutil.copy(_base_cfg, config_path)
+    # Keeps EnvConfigLoader's default .env lookup inside the temp directory
+    monkeypatch.setattr(aidoctool.config_loader.Path, 'home', staticmethod(lambda: temp_dir))
+    monkeypatch.setattr(aidoctool.config, 'CONFIG_PATH', config_path)
+    yield config_path
+    # The directory itself is left for pytest's end-of-session cleanup
+    config_path.unlink(missing_ok=True)
+
+@pytest.fixture
+def manager(isolate_config):
+    return ConfigManager(YamlConfigLoader(config_path=isolate_config))
 
 def test_add_profile():
-    runner = CliRunner()
-    result = runner.invoke(config, ['add', 'testprofile'], input='openai\ngpt-4\nsk-test\n')
+    result = run('add', 'testprofile', input=_PROMPT)
     assert result.exit_code == 0
     assert "Profile 'testprofile' added." in result.output
 
-def test_add_duplicate_profile():
-    runner = CliRunner()
-    runner.invoke(config, ['add', 'dup'], input='openai\ngpt-4\nsk-test\n')
-    result = runner.invoke(config, ['add', 'dup'], input='openai\ngpt-4\nsk-test\n')
+def test_add_duplicate_profile(manager):
+    manager.add_profile('dup', 'openai', 'gpt-4', 'sk-test')
+    result = run('add', 'dup', input=_PROMPT)
     assert result.exit_code != 0
     assert "already exists" in result.output
 
-def test_delete_profile():
-    runner = CliRunner()
-    runner.invoke(config, ['add', 'todelete'], input='openai\ngpt-4\nsk-test\n')
-    result = runner.invoke(config, ['delete', 'todelete'], input='y\n')
+def test_delete_profile(isolate_config):
+    isolate_config.write_text(yaml.dump({
+        'profiles': {'todelete': {'provider': 'openai', 'model': 'gpt-4', 'api_key': 'sk-test'}},
+        'default_profile': None,
+    }, Dumper=_DUMPER))
+    result = run('delete', 'todelete', input='y\n')
     assert result.exit_code == 0
     assert "deleted" in result.output
 
-def test_set_default_profile():
-    runner = CliRunner()
-    runner.invoke(config, ['add', 'p1'], input='openai\ngpt-4\nsk-test\n')
-    runner.invoke(config, ['add', 'p2'], input='openai\ngpt-4\nsk-test\n')
-    result = runner.invoke(config, ['default', 'p2'])
+def test_set_default_profile(manager):
+    with manager.bulk_update():
+        manager.add_profile('p1', 'openai', 'gpt-4', 'sk-test')
+        manager.add_profile('p2', 'openai', 'gpt-4', 'sk-test')
+    result = run('default', 'p2')
     assert result.exit_code == 0
     assert "Default profile set to 'p2'" in result.output
 
-def test_edit_profile(monkeypatch):
-    runner = CliRunner()
-    runner.invoke(config, ['add', 'toedit'], input='openai\ngpt-4\nsk-test\n')
+def test_edit_profile(monkeypatch, isolate_config):
+    isolate_config.write_text(_SEED_YAML)
     # Patch click.edit to simulate editing
     monkeypatch.setattr('click.edit', lambda filename: None)
-    result = runner.invoke(config, ['edit', 'toedit'])
+    result = run('edit', 'toedit')
     assert result.exit_code == 0
     assert "Edited config file" in result.output
 
 def test_delete_nonexistent_profile():
-    runner = CliRunner()
-    result = runner.invoke(config, ['delete', 'nope'], input='y\n')
+    result = run('delete', 'nope', input='y\n')
     assert result.exit_code == 0
     assert "not found" in result.output
 
+def test_add_profile_readonly_source():
+    result = _runner.invoke(cli, ['--config-source', 'env', 'config', 'add', 'ro'], input=_PROMPT, catch_exceptions=False)
+    assert result.exit_code != 0
+    assert "read-only" in result.output
+
 def test_set_default_nonexistent_profile():
-    runner = CliRunner()
-    result = runner.invoke(config, ['default', 'nope'])
+    result = run('default', 'nope')
     assert result.exit_code == 0
     assert "not found" in result.output
 
 # --- New tests for ConfigManager and loaders ---
-def test_config_manager_yaml(tmp_path):
-    config_path = tmp_path / "config.yaml"
+@pytest.fixture
+def shm_path(request):
+    # Memory-backed config file for tests that save repeatedly; falls back
+    # to a pytest temp dir where there is no /dev/shm (macOS, Windows)
+    shm = pathlib.Path('/dev/shm')
+    if not shm.is_dir() or not os.access(shm, os.W_OK):
+        yield request.getfixturevalue('tmp_path_factory').mktemp('shm') / 'config.yaml'
+        return
+    base = pathlib.Path(tempfile.mkdtemp(prefix='aidoc-', dir=shm))
+    yield base / 'config.yaml'
+    shutil.rmtree(base)
+
+def test_config_manager_yaml(shm_path):
+    config_path = shm_path
     loader = YamlConfigLoader(config_path=config_path)
     manager = ConfigManager(loader)
+    assert not manager.has_profile("p1")
     manager.add_profile("p1", "openai", "gpt-4", "sk-test")
     config = manager.get_config()
     assert "p1" in config["profiles"]
+    assert manager.has_profile("p1")
     manager.set_default("p1")
     assert config["default_profile"] == "p1"
     manager.edit_profile("p1", model="gpt-3.5")
@@ -84,6 +135,146 @@ def test_config_manager_yaml(tmp_path):
     manager.delete_profile("p1")
     assert "p1" not in config["profiles"]
 
+@pytest.fixture
+def libyaml():
+    if not yaml.__with_libyaml__:
+        pytest.skip("PyYAML built without libyaml")
+
+def test_yaml_loader_uses_libyaml(libyaml):
+    assert _safe_loader() is yaml.CSafeLoader
+    assert _safe_dumper() is yaml.CSafeDumper
+
+def test_yaml_loader_save_is_atomic_and_private(tmp_path):
+    config_path = tmp_path / "cfg" / "config.yaml"
+    loader = YamlConfigLoader(config_path=config_path)
+    loader.save_config({"default_profile": None, "profiles": {"p1": {"api_key": "sk-test"}}})
+    assert os.listdir(config_path.parent) == ["config.yaml"]
+    assert config_path.stat().st_mode & 0o777 == 0o600
+    assert YamlConfigLoader(config_path=config_path).load_config()["profiles"]["p1"]["api_key"] == "sk-test"
+
+def test_yaml_loader_save_writes_through_symlink(tmp_path):
+    target = tmp_path / "dotfiles" / "config.yaml"
+    target.parent.mkdir()
+    target.write_text("profiles: {}\n")
+    link = tmp_path / "config.yaml"
+    link.symlink_to(target)
+    YamlConfigLoader(config_path=link).save_config({"default_profile": "p", "profiles": {}})
+    assert link.is_symlink()
+    assert "default_profile: p" in target.read_text()
+
+def test_yaml_loader_reloads_changed_file(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("default_profile: a\nprofiles: {}\n")
+    loader = YamlConfigLoader(config_path=config_path)
+    assert loader.load_config()["default_profile"] == "a"
+    assert loader.load_config() == loader.load_config()
+    mtime = config_path.stat().st_mtime_ns
+    config_path.write_text("default_profile: b\nprofiles: {}\n")
+    os.utime(config_path, ns=(mtime + 10**9, mtime + 10**9))
+    assert loader.load_config()["default_profile"] == "b"
+
+def test_yaml_loader_cache_ignores_unsaved_changes(manager, isolate_config):
+    manager.add_profile("p1", "openai", "gpt-4", "sk-test")
+    manager.get_config()["profiles"]["ghost"] = {"provider": "openai"}
+    fresh = YamlConfigLoader(config_path=isolate_config).load_config()
+    assert set(fresh["profiles"]) == {"p1"}
+    fresh["profiles"]["other"] = {}
+    assert "other" not in YamlConfigLoader(config_path=isolate_config).load_config()["profiles"]
+
+def test_yaml_loader_cache_detects_same_mtime_rewrite(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("default_profile: a\nprofiles: {}\n")
+    mtime = config_path.stat().st_mtime_ns
+    assert YamlConfigLoader(config_path=config_path).load_config()["default_profile"] == "a"
+    config_path.write_text("default_profile: longer\nprofiles: {}\n")
+    os.utime(config_path, ns=(mtime, mtime))
+    assert YamlConfigLoader(config_path=config_path).load_config()["default_profile"] == "longer"
+
+def test_yaml_loader_json_sidecar(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.yaml"
+    loader = YamlConfigLoader(config_path=config_path, json_sidecar=True)
+    loader.save_config({"default_profile": "a", "profiles": {}})
+    sidecar = tmp_path / "config.yaml.json"
+    assert sidecar.stat().st_mode & 0o777 == 0o600
+    # A sidecar stamped with the YAML's mtime and size is read in its place
+    monkeypatch.setattr(aidoctool.config_loader, "_yaml_cache", {})
+    st = config_path.stat()
+    stamp = [st.st_mtime_ns, st.st_size]
+    sidecar.write_text(json.dumps({"stamp": stamp, "config": {"default_profile": "from-json", "profiles": {}}}))
+    assert loader.load_config()["default_profile"] == "from-json"
+    # Any other stamp means the YAML changed since, even when it was
+    # replaced by a file with an older mtime; the YAML wins and regenerates
+    # the sidecar
+    monkeypatch.setattr(aidoctool.config_loader, "_yaml_cache", {})
+    config_path.write_text("default_profile: b\nprofiles: {}\n")
+    os.utime(config_path, ns=(st.st_mtime_ns - 10**9, st.st_mtime_ns - 10**9))
+    assert loader.load_config()["default_profile"] == "b"
+    assert json.loads(sidecar.read_text())["config"]["default_profile"] == "b"
+
+def test_yaml_loader_json_sidecar_skips_non_string_keys(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("profiles:\n  1:\n    model: m\n")
+    loader = YamlConfigLoader(config_path=config_path, json_sidecar=True)
+    assert 1 in loader.load_config()["profiles"]
+    assert not (tmp_path / "config.yaml.json").exists()
+
+def test_yaml_loader_json_sidecar_write_failure(tmp_path, monkeypatch):
+    def mkstemp(*args, **kwargs):
+        raise PermissionError("read-only directory")
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("default_profile: a\nprofiles: {}\n")
+    monkeypatch.setattr(tempfile, "mkstemp", mkstemp)
+    loader = YamlConfigLoader(config_path=config_path, json_sidecar=True)
+    assert loader.load_config()["default_profile"] == "a"
+
+def test_legacy_load_config_uses_yaml_loader(tmp_path, monkeypatch):
+    monkeypatch.setenv("AIDOC_TEST_KEY", "sk-from-env")
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("profiles:\n  p1:\n    api_key: ${AIDOC_TEST_KEY}\n")
+    monkeypatch.setattr(aidoctool.config, "CONFIG_PATH", config_path)
+    with pytest.deprecated_call():
+        config = aidoctool.config.load_config()
+    assert config == YamlConfigLoader(config_path=config_path).load_config()
+    assert config["profiles"]["p1"]["api_key"] == "sk-from-env"
+
+def test_yaml_loader_resolves_env_api_key(tmp_path, monkeypatch):
+    monkeypatch.setenv("AIDOC_TEST_KEY", "sk-from-env")
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("profiles:\n  p1:\n    api_key: ${AIDOC_TEST_KEY}\n  p2:\n    api_key: null\n")
+    config = YamlConfigLoader(config_path=config_path).load_config()
+    assert config["profiles"]["p1"]["api_key"] == "sk-from-env"
+    assert config["profiles"]["p2"]["api_key"] is None
+
+def test_config_manager_load_discards_unsaved_changes(manager):
+    manager.add_profile("p1", "openai", "gpt-4", "sk-test")
+    manager.get_config()["profiles"]["ghost"] = {}
+    assert set(manager.load()["profiles"]) == {"p1"}
+
+def test_config_manager_bulk_update_saves_once(tmp_path, monkeypatch):
+    loader = YamlConfigLoader(config_path=tmp_path / "config.yaml")
+    saves = []
+    monkeypatch.setattr(loader, "save_config", saves.append)
+    manager = ConfigManager(loader)
+    with manager.bulk_update():
+        manager.add_profile("p1", "openai", "gpt-4", "sk-test")
+        manager.add_profile("p2", "openai", "gpt-4", "sk-test")
+        assert saves == []
+    assert len(saves) == 1
+    assert set(saves[0]["profiles"]) == {"p1", "p2"}
+
+def test_config_manager_bulk_update_discards_failed_block(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    manager = ConfigManager(YamlConfigLoader(config_path=config_path))
+    with pytest.raises(ValueError):
+        with manager.bulk_update():
+            manager.add_profile("p1", "openai", "gpt-4", "sk-test")
+            manager.add_profile("p1", "openai", "gpt-4", "sk-test")
+    assert not config_path.exists()
+    manager.add_profile("p2", "openai", "gpt-4", "sk-test")
+    saved = yaml.safe_load(config_path.read_text())
+    assert set(saved["profiles"]) == {"p2"}
+    assert saved["default_profile"] == "p2"
+
 def test_readonly_config_manager_env(monkeypatch):
     monkeypatch.setenv("AIDOCTOOL_PROVIDER", "openai")
     monkeypatch.setenv("AIDOCTOOL_MODEL", "gpt-4")
@@ -96,3 +287,20 @@ def test_readonly_config_manager_env(monkeypatch):
         manager.add_profile("fail", "openai", "gpt-4", "sk-test")
     with pytest.raises(NotImplementedError):
         manager.save()
+
+def test_env_loader_returns_fresh_config(monkeypatch):
+    monkeypatch.setenv("AIDOCTOOL_PROVIDER", "openai")
+    EnvConfigLoader().load_config()["profiles"]["x"] = {}
+    assert "x" not in EnvConfigLoader().load_config()["profiles"]
+
+def test_env_config_does_not_load_yaml(run_fresh):
+    # A fresh interpreter, since other tests have already imported PyYAML.
+    # yaml.loader is only imported once PyYAML's package body runs.
+    code = (
+        "import sys\n"
+        "from aidoctool.config_loader import EnvConfigLoader\n"
+        "from aidoctool.config_manager import ReadOnlyConfigManager\n"
+        "ReadOnlyConfigManager(EnvConfigLoader()).get_config()\n"
+        "assert 'yaml.loader' not in sys.modules\n"
+    )
+    run_fresh(code)
@@ -1,7 +1,9 @@
+import click
 import pytest
 from click.testing import CliRunner
 from aidoctool.commands.debug_command import debug
 from aidoctool.cli import cli
+from aidoctool.debug_utils import format_config
 import os
 import sys
 
@@ -53,6 +55,13 @@ def test_debug_info_command():
     assert "System Information" in result.output
     assert "Python version" in result.output
 
+def test_debug_config_reports_loaded_file(setup_test_config):
+    runner = CliRunner()
+    result = runner.invoke(cli, ['debug', 'config'])
+    assert result.exit_code == 0
+    config_file = setup_test_config / ".aidoctool" / "config.yaml"
+    assert f"Config file found at: {config_file}" in result.output
+
 def test_debug_config_verbose(setup_test_config):
     # Test non-verbose (should mask API key)
     runner = CliRunner()
@@ -65,3 +74,52 @@ def test_debug_config_verbose(setup_test_config):
     # Test verbose (should show API key)
     result = runner.invoke(cli, ['debug', 'config', '--verbose'])
     assert result.exit_code == 0
+
+def test_cli_registers_lazy_subcommand_once_resolved():
+    ctx = click.Context(cli)
+    assert cli.get_command(ctx, 'debug') is debug
+    assert cli.commands['debug'] is debug
+    assert cli.get_command(ctx, 'nope') is None
+
+def test_cli_help_lists_lazy_subcommands():
+    runner = CliRunner()
+    result = runner.invoke(cli, ['--help'])
+    assert result.exit_code == 0
+    assert "Manage aidoctool configuration profiles." in result.output
+    assert "Debug and troubleshooting commands." in result.output
+
+def test_cli_help_does_not_import_commands(run_fresh):
+    # A fresh interpreter, since other tests have already imported them
+    code = (
+        "import sys\n"
+        "from aidoctool.cli import cli\n"
+        "try:\n"
+        "    cli(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "assert 'aidoctool.commands.config_command' not in sys.modules\n"
+        "assert 'aidoctool.commands.debug_command' not in sys.modules\n"
+        "assert 'yaml.loader' not in sys.modules\n"
+    )
+    run_fresh(code)
+
+def test_cli_lazy_help_matches_commands():
+    # The help listed without importing must not drift from the docstrings
+    assert set(cli.lazy_help) == set(cli.lazy_subcommands)
+    ctx = click.Context(cli)
+    for name, short_help in cli.lazy_help.items():
+        assert cli.get_command(ctx, name).get_short_help_str() == short_help
+
+def test_format_config_masks_without_mutating():
+    config = {"default_profile": "p", "profiles": {"p": {"provider": "openai", "api_key": "sk-secret"}}}
+    formatted = format_config(config)
+    assert "sk-***" in formatted
+    assert "sk-secret" not in formatted
+    assert config["profiles"]["p"]["api_key"] == "sk-secret"
+    assert "sk-secret" in format_config(config, verbose=True)
+
+def test_format_config_tolerates_malformed_profiles():
+    config = {"profiles": {"bad": None, "p": {"api_key": "sk-secret"}}}
+    formatted = format_config(config)
+    assert "sk-secret" not in formatted
+    assert format_config(["not", "a", "dict"]) == "No configuration found."